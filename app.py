@@ -2,26 +2,67 @@ import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+import threading
 from datetime import datetime
-import yfinance as yf
-from statsmodels.tsa.arima.model import ARIMA
-from sklearn.preprocessing import MinMaxScaler
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense
-from sklearn.metrics import mean_absolute_percentage_error
 
 # Import custom modules
-from config import stock_symbols
-from utils.data_fetcher import get_stock_data
+from config import stock_symbols, stock_options, APP_CONFIG, MODEL_CONFIG
+from utils.data_fetcher import get_stock_data, get_many_stock_data
 from utils.metrics_calculator import calculate_stock_metrics
-from utils.arima_forecaster import ARIMAForecaster
+from utils.arima_forecaster import ARIMAForecaster, batch_forecast, warmup as warmup_arima
 from utils.lstm_forecaster import LSTMForecaster
 from utils.ui_components import create_header, create_footer, create_sidebar
 
 # Page Configuration
 st.set_page_config(page_title="Stock Price Prediction", page_icon="📊", layout="wide")
 
+@st.cache_resource(show_spinner=False)
+def start_forecast_precompute(start_date, end_date):
+    """Precompute ARIMA forecasts for all stocks in a background thread, once per process"""
+    forecasts = {}
+
+    def worker():
+        warmup_arima()
+        frames = get_many_stock_data(list(stock_symbols), start_date, end_date)
+        closes = {symbol: data['Close'] for symbol, data in frames.items()}
+        if closes:
+            forecasts.update(batch_forecast(closes, **MODEL_CONFIG['arima']))
+        # Nothing was precomputed: drop this entry so a later rerun tries again
+        if not forecasts:
+            start_forecast_precompute.clear(start_date, end_date)
+
+    threading.Thread(target=worker, daemon=True).start()
+    return forecasts
+
+def is_fallback(forecast, accuracy):
+    """True for the all-zero, 0% result the forecasters return when fitting fails"""
+    return accuracy == 0 and not np.any(forecast)
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def get_arima(order, series_hash, _close):
+    """Fit ARIMA once per (order, series) and keep the fitted model with its forecast"""
+    # Raising keeps a failed fit out of the cache so the next click retries it
+    forecaster = ARIMAForecaster(order=order)
+    if not forecaster.fit(_close):
+        raise RuntimeError("ARIMA fit failed")
+    forecast, accuracy = forecaster.forecast(_close)
+    if is_fallback(forecast, accuracy):
+        raise RuntimeError("ARIMA fit failed")
+    return forecaster, forecast, accuracy
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_lstm(series_hash, _close):
+    """Train the LSTM once per series and keep the trained model with its predictions"""
+    forecaster = LSTMForecaster()
+    predictions, accuracy = forecaster.forecast(_close)
+    if is_fallback(predictions, accuracy):
+        raise RuntimeError("LSTM training failed")
+    return forecaster, predictions, accuracy
+
+# Forecasts for the default date range are warmed at startup
+precompute_range = (APP_CONFIG['default_start_date'].date(), APP_CONFIG['default_end_date'].date())
+precomputed_forecasts = start_forecast_precompute(*precompute_range)
+
 # Custom header and footer
 create_header()
 create_footer()
@@ -32,7 +73,8 @@ st.markdown(
     unsafe_allow_html=True,)
 
 # Sidebar inputs
-selected_stock, start_date, end_date = create_sidebar(stock_symbols)
+selected_stock, start_date, end_date = create_sidebar(
+    stock_options, APP_CONFIG['default_start_date'], APP_CONFIG['default_end_date'])
 
 if st.sidebar.button("Fetch Data"):
     if start_date >= end_date:
@@ -56,17 +98,12 @@ if st.sidebar.button("Fetch Data"):
             # Calculate stock metrics
             metrics = calculate_stock_metrics(data)
 
-            # Extract scalar values from pandas Series
-            highest_price = metrics['Highest Price'].iloc[0] if isinstance(metrics['Highest Price'], pd.Series) else metrics['Highest Price']
-            lowest_price = metrics['Lowest Price'].iloc[0] if isinstance(metrics['Lowest Price'], pd.Series) else metrics['Lowest Price']
-            average_price = metrics['Average Price'].iloc[0] if isinstance(metrics['Average Price'], pd.Series) else metrics['Average Price']
-
             # Use st.markdown with custom CSS for styling the text
             st.markdown(
                 f"""
-                <h3 style="font-size: 22px;">Highest Price: ₹{highest_price:.2f}</h3>
-                <h3 style="font-size: 22px;">Lowest Price: ₹{lowest_price:.2f}</h3>
-                 <h3 style="font-size: 22px;">Average Price: ₹{average_price:.2f}</h3>
+                <h3 style="font-size: 22px;">Highest Price: ₹{metrics['Highest Price']:.2f}</h3>
+                <h3 style="font-size: 22px;">Lowest Price: ₹{metrics['Lowest Price']:.2f}</h3>
+                 <h3 style="font-size: 22px;">Average Price: ₹{metrics['Average Price']:.2f}</h3>
                 <h3 style="font-size: 22px;">Best Time to Sell: {metrics['Best Time to Sell']}</h3>
                 <h3 style="font-size: 22px;">Best Time to Buy: {metrics['Best Time to Buy']}</h3>
                 """, unsafe_allow_html=True
@@ -74,20 +111,16 @@ if st.sidebar.button("Fetch Data"):
 
         # Display stock data table
         st.markdown(
-        f"<h2 style='text-align: center;'>Stock Data for {stock_symbols[selected_stock]['name']}</h2>",
+        f"<h2 style='text-align: center;'>Stock Data for {stock_info['name']}</h2>",
         unsafe_allow_html=True
         )
         st.write(data)
 
         # Plot Closing Price
         st.markdown("<h3 style='text-align: center; font-size: 36px;'>Stock Closing Price</h3>", unsafe_allow_html=True)
-        plt.figure(figsize=(12, 6))
-        plt.plot(data['Close'], label="Closing Price", color='blue')
-        plt.title(f"{stock_symbols[selected_stock]['name']} Stock Closing Price")
-        plt.xlabel('Date')
-        plt.ylabel('Price')
-        plt.legend()
-        st.pyplot(plt)
+        close = data['Close']
+        close_hash = hash(close.to_numpy().tobytes())
+        st.line_chart(close.rename("Closing Price"), color="#0000FF")
 
         # Add space between ARIMA Table and Plot Closing Price
         st.markdown("<br><br>", unsafe_allow_html=True)
@@ -98,26 +131,29 @@ if st.sidebar.button("Fetch Data"):
         unsafe_allow_html=True
         )
 
-        arima_forecaster = ARIMAForecaster()
-        arima_forecast, arima_accuracy = arima_forecaster.forecast(data['Close'])
+        if (start_date, end_date) == precompute_range and selected_stock in precomputed_forecasts:
+            arima_forecast, arima_accuracy = precomputed_forecasts[selected_stock]
+        else:
+            try:
+                arima_forecaster, arima_forecast, arima_accuracy = get_arima(
+                    MODEL_CONFIG['arima']['order'], close_hash, close)
+            except RuntimeError:
+                arima_forecast, arima_accuracy = np.zeros(MODEL_CONFIG['arima']['forecast_steps']), 0.0
         
         st.markdown(f"<h3>ARIMA Model Accuracy: {arima_accuracy:.2f}%</h3>", unsafe_allow_html=True)
 
+        # Business days following the last close, shared by the plot and the table
+        arima_forecast_dates = pd.bdate_range(data.index[-1] + pd.Timedelta(days=1), periods=len(arima_forecast))
+
         # Plot ARIMA Forecast
-        plt.figure(figsize=(12, 6))
-        plt.plot(data['Close'], label="Actual Close Price", color='blue')
-        plt.plot(pd.date_range(data.index[-1], periods=31, freq='B')[1:], arima_forecast, label="Forecasted", color='red')
-        plt.title(f"ARIMA Forecast for {stock_symbols[selected_stock]['name']}")
-        plt.xlabel('Date')
-        plt.ylabel('Price')
-        plt.legend()
-        st.pyplot(plt)
+        arima_plot_df = pd.concat([
+            close.rename("Actual Close Price"),
+            pd.Series(np.asarray(arima_forecast), index=arima_forecast_dates, name="Forecasted")
+        ], axis=1)
+        st.line_chart(arima_plot_df, color=["#0000FF", "#FF0000"])
 
         # ARIMA Forecast Table
-        arima_forecast_dates = pd.date_range(data.index[-1], periods=31, freq='B')[1:]
-        arima_forecast_df = pd.DataFrame({'Date': arima_forecast_dates, 'Forecasted Price': arima_forecast})
-        arima_forecast_df['Date'] = pd.to_datetime(arima_forecast_df['Date'])
-        arima_forecast_df['Forecasted Price'] = arima_forecast_df['Forecasted Price'].round(2)
+        arima_forecast_df = pd.DataFrame({'Date': arima_forecast_dates, 'Forecasted Price': np.round(np.asarray(arima_forecast, dtype=np.float64), 2)})
         
         st.markdown(
         "<br><br><h2 style='text-align: center;'>ARIMA Forecast Table</h2><br>",
@@ -130,25 +166,22 @@ if st.sidebar.button("Fetch Data"):
         # LSTM Forecasting
         st.markdown("<br><br><h3 style='text-align: center; font-size: 36px;'>LSTM Model Forecast</h3><br><br>", unsafe_allow_html=True)
         
-        lstm_forecaster = LSTMForecaster()
-        lstm_predictions, lstm_accuracy = lstm_forecaster.forecast(data['Close'])
+        try:
+            lstm_forecaster, lstm_predictions, lstm_accuracy = get_lstm(close_hash, close)
+        except RuntimeError:
+            lstm_predictions, lstm_accuracy = np.zeros(max(len(close) - MODEL_CONFIG['lstm']['time_steps'], 0)), 0.0
         
         st.markdown(f"<h3>LSTM Model Accuracy: {lstm_accuracy:.2f}%</h3>", unsafe_allow_html=True)
 
         # Plot LSTM Predictions
-        plt.figure(figsize=(12, 6))
-        plt.plot(data['Close'], label="Actual Close Price", color='blue')
-        plt.plot(data.index[-len(lstm_predictions):], lstm_predictions, label="LSTM Prediction", color='orange')
-        plt.title(f"LSTM Model Prediction for {stock_symbols[selected_stock]['name']}")
-        plt.xlabel('Date')
-        plt.ylabel('Price')
-        plt.legend()
-        st.pyplot(plt)
+        lstm_plot_df = pd.concat([
+            close.rename("Actual Close Price"),
+            pd.Series(lstm_predictions.flatten(), index=data.index[-len(lstm_predictions):], name="LSTM Prediction")
+        ], axis=1)
+        st.line_chart(lstm_plot_df, color=["#0000FF", "#FFA500"])
 
         # LSTM Prediction Table with rounded values
         st.markdown("<br><br><h2 style='text-align: center;'>LSTM Model Prediction Table</h2><br>", unsafe_allow_html=True)
         lstm_dates = data.index[-len(lstm_predictions):]
-        lstm_df = pd.DataFrame({'Date': lstm_dates, 'Predicted Price': lstm_predictions.flatten()})
-        lstm_df['Date'] = pd.to_datetime(lstm_df['Date'])
-        lstm_df['Predicted Price'] = lstm_df['Predicted Price'].round(2)  # Round to 2 decimal places
+        lstm_df = pd.DataFrame({'Date': lstm_dates, 'Predicted Price': np.round(lstm_predictions.astype(np.float64).ravel(), 2)})  # Round to 2 decimal places
         st.dataframe(lstm_df) 
\ No newline at end of file
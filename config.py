@@ -1,7 +1,11 @@
 # Stock Project Configuration
 # Contains stock symbols, company information, and metadata
 
-stock_symbols = {
+from datetime import datetime
+from types import MappingProxyType
+
+# Read-only view so the shared mapping cannot be mutated across reruns/threads
+stock_symbols = MappingProxyType({
     "TCS.NS": {
         "name": "Tata Consultancy Services",
         "founder": "J. R. D. Tata",
@@ -122,14 +126,19 @@ stock_symbols = {
         "history": "Established in 1945, Bajaj Auto revolutionized two-wheeler manufacturing.",
         "present_condition": "Bajaj Auto is a leading manufacturer of motorcycles and scooters globally."
     }
-}
+})
+
+# Sidebar labels ("SYMBOL - Name"), built once since the mapping is frozen
+stock_options = tuple(f"{symbol} - {details['name']}" for symbol, details in stock_symbols.items())
 
 # Application Configuration
 APP_CONFIG = {
     "title": "Stock Data Analyzer",
     "icon": "📊",
     "layout": "wide",
-    "page_title": "Stock Price Prediction"
+    "page_title": "Stock Price Prediction",
+    "default_start_date": datetime(2020, 1, 1),
+    "default_end_date": datetime(2025, 1, 1)
 }
 
 # Model Configuration
@@ -142,6 +151,7 @@ MODEL_CONFIG = {
         "time_steps": 60,
         "units": 50,
         "epochs": 10,
-        "batch_size": 32
+        "batch_size": 32,
+        "num_layers": 1
     }
 } 
\ No newline at end of file
@@ -103,6 +103,90 @@ def test_utility_functions():
         print(f"Utility functions error: {e}")
         return False
 
+def test_numba_lstm_inference():
+    """Test that the numba LSTM kernels reproduce the Keras model's predictions"""
+    print("\nTesting numba LSTM inference...")
+    
+    import numpy as np
+    import pandas as pd
+    from utils.lstm_forecaster import LSTMForecaster
+    
+    rng = np.random.default_rng(0)
+    series = pd.Series(np.cumsum(rng.standard_normal(150)) + 100)
+    
+    for num_layers in (1, 2):
+        forecaster = LSTMForecaster(time_steps=20, units=8, epochs=1, num_layers=num_layers, backend="numba")
+        assert forecaster.fit(series), "LSTM fit failed"
+        
+        x = forecaster._cached_x
+        max_diff = np.abs(forecaster._predict_numba(x) - forecaster._predict_keras(x)).max()
+        print(f"{num_layers}-layer LSTM: numba vs Keras max difference {max_diff:.2e}")
+        assert max_diff < 1e-5, f"numba LSTM diverges from Keras by {max_diff}"
+    
+    return True
+
+def test_metrics_match_pandas():
+    """Test the NumPy/numba metrics against their pandas definitions"""
+    print("\nTesting metrics against pandas...")
+    
+    import warnings
+    import numpy as np
+    import pandas as pd
+    from utils.metrics_calculator import calculate_risk_metrics, calculate_technical_indicators
+    
+    def close_enough(actual, expected):
+        return np.isclose(actual, expected, rtol=1e-9, atol=1e-12, equal_nan=True)
+    
+    rng = np.random.default_rng(42)
+    cases = {
+        "random walk": np.cumsum(rng.standard_normal(500)) + 300,
+        "three closes": np.array([100.0, 103.0, 101.0]),
+        "four closes": np.array([100.0, 103.0, 101.0, 104.0]),
+        "flat series": np.full(60, 100.0),
+        "missing closes": np.where(np.isin(np.arange(500), [0, 100, 101, 497]), np.nan,
+                                   np.cumsum(rng.standard_normal(500)) + 300),
+    }
+    
+    for name, values in cases.items():
+        close = pd.Series(values)
+        data = pd.DataFrame({"Close": values})
+        
+        # Risk metrics
+        returns = close.ffill().pct_change().dropna()  # pct_change()'s default padding
+        with warnings.catch_warnings():
+            # Degenerate series (e.g. flat prices) must not trip NumPy's divide warnings
+            warnings.simplefilter("error", RuntimeWarning)
+            risk = calculate_risk_metrics(data)
+        expected_risk = {
+            "Max Drawdown": (close / close.expanding().max() - 1).min(),
+            "Value at Risk (95%)": returns.quantile(0.05),
+            "Standard Deviation": returns.std(),
+            "Skewness": returns.skew(),
+            "Kurtosis": returns.kurtosis(),
+        }
+        for key, expected in expected_risk.items():
+            assert close_enough(risk[key], expected), f"{name}: {key} {risk[key]} != {expected}"
+        
+        # Technical indicators
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        indicators = calculate_technical_indicators(data)
+        expected_indicators = {
+            "MA_20": close.rolling(window=20).mean().iloc[-1],
+            "MA_50": close.rolling(window=50).mean().iloc[-1],
+            "RSI": (100 - 100 / (1 + gain / loss)).iloc[-1],
+            "MACD": macd.iloc[-1],
+            "Signal_Line": macd.ewm(span=9, adjust=False).mean().iloc[-1],
+        }
+        for key, expected in expected_indicators.items():
+            assert close_enough(indicators[key], expected), f"{name}: {key} {indicators[key]} != {expected}"
+        
+        print(f"Metrics match pandas for {name}")
+    
+    return True
+
 def main():
     """Main test function"""
     print("Stock Project - Structure Test")
@@ -112,15 +196,20 @@ def main():
     tests = [
         test_imports,
         test_config,
-        test_utility_functions
+        test_utility_functions,
+        test_numba_lstm_inference,
+        test_metrics_match_pandas
     ]
     
     passed = 0
     total = len(tests)
     
     for test in tests:
-        if test():
-            passed += 1
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"Check failed: {e}")
     
     print("\n" + "=" * 50)
     print(f"Test Results: {passed}/{total} tests passed")
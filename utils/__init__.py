@@ -1 +1,9 @@
-# Utils package for Stock Project 
\ No newline at end of file
+# Utils package for Stock Project
+
+import os
+
+# Persist numba-compiled kernels in a project-local cache so reruns skip JIT
+os.environ.setdefault(
+    "NUMBA_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".numba_cache"),
+)
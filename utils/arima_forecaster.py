@@ -5,33 +5,71 @@ Handles ARIMA model forecasting for stock prices
 
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.arima.model import ARIMA
-from sklearn.metrics import mean_absolute_percentage_error
-from typing import Tuple
+import streamlit as st
+import functools
+from numba import njit
+from typing import Dict, Tuple, Union
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def _get_statsforecast():
+    """Import statsforecast on first use; it pulls in statsmodels and takes seconds to load"""
+    import statsforecast.models
+    return statsforecast
+
+# Explicit signature compiles eagerly at import instead of on the first call
+@njit('f8(f8[:], f8[:])', cache=True, fastmath=True)
+def _mape(actual: np.ndarray, pred: np.ndarray) -> float:
+    """Mean absolute percentage error of two equal-length float64 arrays"""
+    s = 0.0
+    n = actual.shape[0]
+    for i in range(n):
+        s += abs((actual[i] - pred[i]) / actual[i])
+    return s / n
+
+def warmup() -> None:
+    """
+    Import statsforecast and run the compiled kernels once so the first forecast pays no JIT cost
+    
+    Meant to be called off the request path (e.g. from a background thread at startup).
+    """
+    try:
+        _mape(np.array([1.0, 2.0]), np.array([1.1, 2.1]))
+        _get_statsforecast().models.ARIMA(order=(1, 0, 0)).fit(np.arange(20, dtype=np.float64))
+    except Exception as e:
+        logger.warning(f"ARIMA warmup failed: {str(e)}")
+
 class ARIMAForecaster:
     """
     ARIMA Model Forecaster for stock price prediction
     """
     
-    def __init__(self, order: Tuple[int, int, int] = (5, 1, 0), forecast_steps: int = 30):
+    BACKENDS = ("statsforecast", "statsmodels")
+    
+    def __init__(self, order: Tuple[int, int, int] = (5, 1, 0), forecast_steps: int = 30,
+                 backend: str = "statsforecast"):
         """
         Initialize ARIMA Forecaster
         
         Args:
             order (Tuple[int, int, int]): ARIMA order (p, d, q)
             forecast_steps (int): Number of steps to forecast
+            backend (str): Fitting backend, "statsforecast" (default) or "statsmodels"
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown ARIMA backend '{backend}', expected one of {self.BACKENDS}")
+        
         self.order = order
         self.forecast_steps = forecast_steps
+        self.backend = backend
         self.model = None
         self.model_fit = None
-        logger.info(f"ARIMA Forecaster initialized with order {order}")
+        self._y = None
+        logger.info(f"ARIMA Forecaster initialized with order {order} ({backend} backend)")
     
     def fit(self, data: pd.Series) -> bool:
         """
@@ -46,9 +84,19 @@ class ARIMAForecaster:
         try:
             logger.info("Fitting ARIMA model")
             
+            # Plain contiguous float64 values; the date index is not used by either backend
+            y = np.ascontiguousarray(np.asarray(data, dtype=np.float64).ravel())
+            self._y = y
+            
             # Create and fit ARIMA model
-            self.model = ARIMA(data, order=self.order)
-            self.model_fit = self.model.fit()
+            if self.backend == "statsforecast":
+                self.model = _get_statsforecast().models.ARIMA(order=self.order)
+                self.model_fit = self.model.fit(y=y)
+            else:
+                # Imported lazily; statsmodels is only needed for the fallback backend
+                from statsmodels.tsa.arima.model import ARIMA
+                self.model = ARIMA(y, order=self.order)
+                self.model_fit = self.model.fit()
             
             logger.info("ARIMA model fitted successfully")
             return True
@@ -61,6 +109,11 @@ class ARIMAForecaster:
         """
         Generate forecast using ARIMA model
         
+        A model already fitted on the same values is reused. Otherwise the forecast
+        (not the model) is cached on the bytes of the series, so repeating it for
+        identical values (even under a different date index) skips the fit; call
+        fit() first when the fitted model itself is needed.
+        
         Args:
             data (pd.Series): Time series data
             
@@ -70,15 +123,13 @@ class ARIMAForecaster:
         try:
             logger.info("Generating ARIMA forecast")
             
-            # Fit the model first
-            if not self.fit(data):
-                raise Exception("Failed to fit ARIMA model")
-            
-            # Generate forecast
-            forecast = self.model_fit.forecast(steps=self.forecast_steps)
-            
-            # Calculate accuracy
-            accuracy = self._calculate_accuracy(data, forecast)
+            # Explicit cache key: raw float64 values, order, steps and backend
+            close_bytes = np.ascontiguousarray(np.asarray(data, dtype=np.float64).ravel()).tobytes()
+            if self.model_fit is not None and self._y is not None and self._y.tobytes() == close_bytes:
+                forecast = self._predict(self.forecast_steps)
+                accuracy = self._calculate_accuracy(self._y, forecast)
+            else:
+                forecast, accuracy = _cached_arima_forecast(close_bytes, self.order, self.forecast_steps, self.backend)
             
             logger.info(f"ARIMA forecast generated successfully with {accuracy:.2f}% accuracy")
             return forecast, accuracy
@@ -88,12 +139,26 @@ class ARIMAForecaster:
             # Return default values
             return np.zeros(self.forecast_steps), 0.0
     
-    def _calculate_accuracy(self, data: pd.Series, forecast: np.ndarray) -> float:
+    def _predict(self, steps: int) -> np.ndarray:
+        """
+        Produce point forecasts from the fitted model of the active backend
+        
+        Args:
+            steps (int): Number of steps to forecast
+            
+        Returns:
+            np.ndarray: Forecast values
+        """
+        if self.backend == "statsforecast":
+            return np.asarray(self.model_fit.predict(h=steps)['mean'])
+        return np.asarray(self.model_fit.forecast(steps=steps))
+    
+    def _calculate_accuracy(self, data: Union[pd.Series, np.ndarray], forecast: np.ndarray) -> float:
         """
         Calculate forecast accuracy using MAPE
         
         Args:
-            data (pd.Series): Actual data
+            data (Union[pd.Series, np.ndarray]): Actual data, e.g. the fitted array self._y
             forecast (np.ndarray): Forecasted values
             
         Returns:
@@ -101,16 +166,15 @@ class ARIMAForecaster:
         """
         try:
             # Use last 30 actual values for accuracy calculation
-            actual_values = data[-30:].values
+            actual_values = np.asarray(data, dtype=np.float64).ravel()[-30:]
+            forecast_subset = np.asarray(forecast, dtype=np.float64).ravel()[:len(actual_values)]
             
             # Ensure forecast has enough values
-            if len(forecast) < len(actual_values):
-                forecast_subset = forecast[:len(actual_values)]
-            else:
-                forecast_subset = forecast[:len(actual_values)]
+            if len(forecast_subset) < len(actual_values):
+                raise ValueError(f"Forecast has {len(forecast_subset)} values, expected {len(actual_values)}")
             
             # Calculate MAPE
-            mape = mean_absolute_percentage_error(actual_values, forecast_subset)
+            mape = _mape(np.ascontiguousarray(actual_values), np.ascontiguousarray(forecast_subset))
             
             # Convert to accuracy percentage
             accuracy = 100 - (mape * 100)
@@ -129,6 +193,9 @@ class ARIMAForecaster:
             str: Model summary
         """
         if self.model_fit is not None:
+            if self.backend == "statsforecast":
+                fitted = self.model_fit.model_
+                return f"ARIMA{self.order} - AIC: {fitted['aic']:.2f}, BIC: {fitted['bic']:.2f}, sigma2: {fitted['sigma2']:.4f}"
             return str(self.model_fit.summary())
         else:
             return "Model not fitted yet"
@@ -137,6 +204,9 @@ class ARIMAForecaster:
         """
         Get forecast confidence intervals
         
+        The model is only fitted on data if it has not been fitted yet, so calling
+        this after forecast() reuses that fit.
+        
         Args:
             data (pd.Series): Time series data
             confidence_level (float): Confidence level (0.95 for 95%)
@@ -145,22 +215,97 @@ class ARIMAForecaster:
             Tuple[np.ndarray, np.ndarray]: Lower and upper confidence bounds
         """
         try:
-            if not self.fit(data):
+            if self.model_fit is None and not self.fit(data):
                 raise Exception("Failed to fit ARIMA model")
             
-            # Get forecast with confidence intervals
-            forecast_result = self.model_fit.forecast(steps=self.forecast_steps)
-            
-            # For simplicity, return basic confidence intervals
-            # In a production environment, you might want to use get_forecast() method
-            std_dev = data.std()
-            z_score = 1.96  # 95% confidence interval
-            
-            lower_bound = forecast_result - (z_score * std_dev)
-            upper_bound = forecast_result + (z_score * std_dev)
+            # Prediction intervals from the fitted model
+            if self.backend == "statsforecast":
+                level = confidence_level * 100
+                result = self.model_fit.predict(h=self.forecast_steps, level=[level])
+                lower_bound = np.asarray(result[f"lo-{level}"])
+                upper_bound = np.asarray(result[f"hi-{level}"])
+            else:
+                conf_int = self.model_fit.get_forecast(steps=self.forecast_steps).conf_int(alpha=1 - confidence_level)
+                conf_int = np.asarray(conf_int)
+                lower_bound, upper_bound = conf_int[:, 0], conf_int[:, 1]
             
             return lower_bound, upper_bound
             
         except Exception as e:
             logger.error(f"Error getting confidence intervals: {str(e)}")
-            return np.zeros(self.forecast_steps), np.zeros(self.forecast_steps) 
\ No newline at end of file
+            return np.zeros(self.forecast_steps), np.zeros(self.forecast_steps)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_arima_forecast(close_bytes: bytes, order: Tuple[int, int, int], forecast_steps: int,
+                           backend: str) -> Tuple[np.ndarray, float]:
+    """
+    Fit ARIMA and forecast, cached on the raw bytes of the series
+    
+    Only the forecast is cached: st.cache_data pickles its results, and fitted
+    statsmodels results run to megabytes each.
+    
+    Args:
+        close_bytes (bytes): Closing prices as contiguous float64 bytes
+        order (Tuple[int, int, int]): ARIMA order (p, d, q)
+        forecast_steps (int): Number of steps to forecast
+        backend (str): Fitting backend
+        
+    Returns:
+        Tuple[np.ndarray, float]: Forecast values and accuracy
+    """
+    close = np.frombuffer(close_bytes, dtype=np.float64).copy()
+    
+    forecaster = ARIMAForecaster(order=order, forecast_steps=forecast_steps, backend=backend)
+    if not forecaster.fit(close):
+        raise Exception("Failed to fit ARIMA model")
+    
+    forecast = forecaster._predict(forecast_steps)
+    accuracy = forecaster._calculate_accuracy(forecaster._y, forecast)
+    return forecast, accuracy
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def _cached_batch_forecast(closes: Dict[str, pd.Series], order: Tuple[int, int, int],
+                           forecast_steps: int) -> Dict[str, Tuple[np.ndarray, float]]:
+    """Fit and score a statsforecast batch; raises on failure so errors are not cached"""
+    # Build long-format frame expected by statsforecast
+    df = pd.concat([
+        pd.DataFrame({'unique_id': symbol, 'ds': close.index, 'y': np.asarray(close, dtype=np.float64).ravel()})
+        for symbol, close in closes.items()
+    ], ignore_index=True)
+    
+    statsforecast = _get_statsforecast()
+    sf = statsforecast.StatsForecast(models=[statsforecast.models.ARIMA(order=order)], freq='B', n_jobs=-1)
+    result = sf.forecast(df=df, h=forecast_steps)
+    
+    # Score each forecast the same way as ARIMAForecaster.forecast
+    forecaster = ARIMAForecaster(order=order, forecast_steps=forecast_steps)
+    forecasts = {}
+    for symbol, group in result.groupby('unique_id', sort=False):
+        forecast = group['ARIMA'].to_numpy()
+        forecasts[symbol] = (forecast, forecaster._calculate_accuracy(closes[symbol], forecast))
+    return forecasts
+
+def batch_forecast(closes: Dict[str, pd.Series], order: Tuple[int, int, int] = (5, 1, 0),
+                   forecast_steps: int = 30) -> Dict[str, Tuple[np.ndarray, float]]:
+    """
+    Fit ARIMA models for several stocks in a single statsforecast batch
+    
+    Args:
+        closes (Dict[str, pd.Series]): Closing prices keyed by stock symbol
+        order (Tuple[int, int, int]): ARIMA order (p, d, q)
+        forecast_steps (int): Number of steps to forecast
+        
+    Returns:
+        Dict[str, Tuple[np.ndarray, float]]: Forecast values and accuracy per symbol, empty if failed
+    """
+    try:
+        logger.info(f"Generating batch ARIMA forecast for {len(closes)} stocks")
+        
+        forecasts = _cached_batch_forecast(closes, order, forecast_steps)
+        
+        logger.info("Batch ARIMA forecast generated successfully")
+        return forecasts
+        
+    except Exception as e:
+        logger.error(f"Error generating batch ARIMA forecast: {str(e)}")
+        return {}
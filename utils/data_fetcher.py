@@ -5,14 +5,99 @@ Handles fetching stock data from Yahoo Finance API
 
 import yfinance as yf
 import pandas as pd
-from datetime import datetime
-from typing import Optional, Union
+import numpy as np
+import streamlit as st
+import copy
+import functools
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Cache settings for Yahoo Finance responses
+CACHE_TTL = 3600  # seconds
+CACHE_MAXSIZE = 256
+
+# Columns kept from Yahoo Finance downloads
+PRICE_COLUMNS = ['Close', 'Volume']
+
+def _memoize(func: Callable) -> Callable:
+    """
+    Cache a Yahoo Finance call in-process
+    
+    Uses st.cache_data when running inside a Streamlit app and falls back to
+    functools.lru_cache otherwise (tests, scripts). Cached values are copied on
+    the lru_cache path so callers can mutate the result safely.
+    
+    Args:
+        func (Callable): Function with hashable positional arguments
+    
+    Returns:
+        Callable: Cached function
+    """
+    st_cached = st.cache_data(ttl=CACHE_TTL, show_spinner=False)(func)
+    lru_cached = functools.lru_cache(maxsize=CACHE_MAXSIZE)(func)
+    
+    @functools.wraps(func)
+    def wrapper(*args: Any) -> Any:
+        if st.runtime.exists():
+            return st_cached(*args)
+        return copy.deepcopy(lru_cached(*args))
+    
+    return wrapper
+
+def _to_iso(value: Union[str, date, datetime]) -> str:
+    """Normalize a date-like value to an ISO date string for cache keys"""
+    return pd.Timestamp(value).date().isoformat()
+
+def _prune(data: pd.DataFrame) -> pd.DataFrame:
+    """Keep only the columns the app consumes; float32 halves the cached frame"""
+    return data[PRICE_COLUMNS].astype({'Close': np.float32})
+
+@_memoize
+def _cached_download(stock_symbol: str, start_iso: str, end_iso: str) -> pd.DataFrame:
+    """Download stock data, cached on (symbol, start, end)"""
+    data = yf.download(stock_symbol, start=start_iso, end=end_iso,
+                       progress=False, threads=False, actions=False)
+    
+    # Raise instead of returning so empty (often transient) responses are not cached
+    if data.empty:
+        raise LookupError(f"No data found for {stock_symbol}")
+    
+    # Single-ticker downloads come back with (Price, Ticker) columns
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+    
+    return _prune(data)
+
+@_memoize
+def _cached_download_many(stock_symbols: Tuple[str, ...], start_iso: str, end_iso: str) -> Dict[str, pd.DataFrame]:
+    """Download several stocks in one threaded request, cached on (symbols, start, end)"""
+    raw = yf.download(" ".join(stock_symbols), start=start_iso, end=end_iso, group_by='ticker',
+                      progress=False, threads=True, actions=False)
+    
+    frames = {}
+    fetched = set(raw.columns.get_level_values(0))
+    for stock_symbol in stock_symbols:
+        data = raw[stock_symbol].dropna(how='all') if stock_symbol in fetched else None
+        if data is None or data.empty:
+            logger.warning(f"No data found for {stock_symbol}")
+            continue
+        frames[stock_symbol] = _prune(data)
+    
+    # Raise instead of returning so empty (often transient) responses are not cached
+    if not frames:
+        raise LookupError(f"No data found for {', '.join(stock_symbols)}")
+    return frames
+
+@_memoize
+def _cached_ticker_info(stock_symbol: str) -> Optional[dict]:
+    """Fetch ticker info, cached on symbol"""
+    return yf.Ticker(stock_symbol).info
+
 def get_stock_data(stock_symbol: str, start_date: Union[str, datetime], end_date: Union[str, datetime]) -> Optional[pd.DataFrame]:
     """
     Fetch stock data from Yahoo Finance API
@@ -29,19 +114,46 @@ def get_stock_data(stock_symbol: str, start_date: Union[str, datetime], end_date
         logger.info(f"Fetching data for {stock_symbol} from {start_date} to {end_date}")
         
         # Download stock data
-        data = yf.download(stock_symbol, start=start_date, end=end_date)
+        data = _cached_download(stock_symbol, _to_iso(start_date), _to_iso(end_date))
         
-        if data.empty:
-            logger.warning(f"No data found for {stock_symbol}")
-            return None
-            
         logger.info(f"Successfully fetched {len(data)} records for {stock_symbol}")
         return data
         
+    except LookupError as e:
+        logger.warning(str(e))
+        return None
     except Exception as e:
         logger.error(f"Error fetching data for {stock_symbol}: {str(e)}")
         return None
 
+def get_many_stock_data(stock_symbols: List[str], start_date: Union[str, datetime], end_date: Union[str, datetime]) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch stock data for several symbols in one multi-threaded Yahoo Finance request
+    
+    Args:
+        stock_symbols (List[str]): Stock symbols (e.g., ['TCS.NS', 'INFY.NS'])
+        start_date (Union[str, datetime]): Start date for data
+        end_date (Union[str, datetime]): End date for data
+    
+    Returns:
+        Dict[str, pd.DataFrame]: Stock data keyed by symbol, symbols without data are omitted
+    """
+    try:
+        logger.info(f"Fetching data for {len(stock_symbols)} stocks from {start_date} to {end_date}")
+        
+        # Download all stocks at once
+        frames = _cached_download_many(tuple(stock_symbols), _to_iso(start_date), _to_iso(end_date))
+        
+        logger.info(f"Successfully fetched data for {len(frames)} of {len(stock_symbols)} stocks")
+        return frames
+        
+    except LookupError as e:
+        logger.warning(str(e))
+        return {}
+    except Exception as e:
+        logger.error(f"Error fetching data for {len(stock_symbols)} stocks: {str(e)}")
+        return {}
+
 def validate_stock_symbol(stock_symbol: str) -> bool:
     """
     Validate if stock symbol exists
@@ -53,8 +165,7 @@ def validate_stock_symbol(stock_symbol: str) -> bool:
         bool: True if valid, False otherwise
     """
     try:
-        ticker = yf.Ticker(stock_symbol)
-        info = ticker.info
+        info = _cached_ticker_info(stock_symbol)
         return info is not None and len(info) > 0
     except:
         return False
@@ -70,8 +181,7 @@ def get_stock_info(stock_symbol: str) -> Optional[dict]:
         Optional[dict]: Stock information or None
     """
     try:
-        ticker = yf.Ticker(stock_symbol)
-        info = ticker.info
+        info = _cached_ticker_info(stock_symbol)
         return info
     except Exception as e:
         logger.error(f"Error getting info for {stock_symbol}: {str(e)}")
@@ -5,40 +5,131 @@ Handles LSTM neural network forecasting for stock prices
 
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense
+import functools
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.metrics import mean_absolute_percentage_error
-from typing import Tuple
+from numba import njit
+from typing import TYPE_CHECKING, Optional, Tuple, Union
 import logging
 
+if TYPE_CHECKING:
+    import tensorflow as tf
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def _get_tensorflow():
+    """Import TensorFlow on first use; loading it takes seconds and hundreds of MB"""
+    import tensorflow as tf
+    return tf
+
+@njit(cache=True, fastmath=True)
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    """Logistic sigmoid, matching the Keras recurrent activation (keeps the input dtype)"""
+    return 1 / (1 + np.exp(-x))
+
+@njit(cache=True, fastmath=True)
+def _lstm_layer(x: np.ndarray, kernel: np.ndarray, recurrent_kernel: np.ndarray, bias: np.ndarray) -> np.ndarray:
+    """
+    Run one Keras-compatible LSTM layer over a (batch, time, features) array
+    
+    Gates are packed in Keras order (input, forget, cell, output); returns the
+    hidden state at every time step in the dtype of the inputs.
+    """
+    batch, steps, _ = x.shape
+    units = recurrent_kernel.shape[0]
+    h = np.zeros((batch, units), dtype=x.dtype)
+    c = np.zeros((batch, units), dtype=x.dtype)
+    out = np.empty((batch, steps, units), dtype=x.dtype)
+    for t in range(steps):
+        z = np.ascontiguousarray(x[:, t, :]) @ kernel + h @ recurrent_kernel + bias
+        i = _sigmoid(z[:, :units])
+        f = _sigmoid(z[:, units:2 * units])
+        g = np.tanh(z[:, 2 * units:3 * units])
+        o = _sigmoid(z[:, 3 * units:])
+        c = f * c + i * g
+        h = o * np.tanh(c)
+        out[:, t, :] = h
+    return out
+
 class LSTMForecaster:
     """
     LSTM Neural Network Forecaster for stock price prediction
     """
     
-    def __init__(self, time_steps: int = 60, units: int = 50, epochs: int = 10, batch_size: int = 32):
+    BACKENDS = ("numba", "tflite", "keras")
+    
+    def __init__(self, time_steps: int = 60, units: int = 50, epochs: int = 10, batch_size: int = 32,
+                 num_layers: int = 1, backend: str = "numba", quantize: bool = False, mixed_precision: Optional[bool] = None):
         """
         Initialize LSTM Forecaster
         
         Args:
             time_steps (int): Number of time steps for LSTM input
             units (int): Number of LSTM units
-            epochs (int): Number of training epochs
+            epochs (int): Maximum number of training epochs (training stops early once the
+                validation loss stops improving)
             batch_size (int): Batch size for training
+            num_layers (int): Number of stacked LSTM layers
+            backend (str): Inference backend, "numba" (default), "tflite" or "keras"
+            quantize (bool): Store TFLite weights as int8 (dynamic-range quantization); tflite backend only
+            mixed_precision (Optional[bool]): Train in float16 with loss scaling; None enables it
+                only when a GPU is available
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown LSTM backend '{backend}', expected one of {self.BACKENDS}")
+        if quantize and backend != "tflite":
+            raise ValueError(f"quantize=True requires backend='tflite', got '{backend}'")
+        
         self.time_steps = time_steps
         self.units = units
         self.epochs = epochs
         self.batch_size = batch_size
-        self.scaler = MinMaxScaler(feature_range=(0, 1))
+        self.num_layers = num_layers
+        self.backend = backend
+        self.quantize = quantize
+        self.mixed_precision = mixed_precision
+        self._scale_min = np.float32(0)
+        self._scale_range = np.float32(1)
         self.model = None
+        self.interpreter = None
+        self._lstm_weights = []
+        self._dense_weights = None
+        self._last_data_hash = None
+        self._cached_x = None
+        self._rollout_fn = None
+        self._predict_fn = None
         logger.info(f"LSTM Forecaster initialized with {units} units, {time_steps} time steps")
     
+    def _as_array(self, data: Union[pd.Series, np.ndarray]) -> np.ndarray:
+        """Normalise input to a float32 column (no copy when it already is one)"""
+        return np.asarray(data, dtype=np.float32).reshape(-1, 1)
+    
+    def _fit_scaler(self, values: np.ndarray) -> np.ndarray:
+        """
+        Fit the [0, 1] min-max scaling to the data and return the scaled data
+        
+        Args:
+            values (np.ndarray): float32 data of shape (samples, 1)
+            
+        Returns:
+            np.ndarray: Scaled data
+        """
+        self._scale_min = values.min()
+        # A flat series keeps a unit range, as sklearn's MinMaxScaler does
+        self._scale_range = (values.max() - self._scale_min) or np.float32(1)
+        return self._scale(values)
+    
+    def _scale(self, values: np.ndarray) -> np.ndarray:
+        """Map values onto the fitted [0, 1] range"""
+        return (values - self._scale_min) / self._scale_range
+    
+    def _inverse(self, scaled: np.ndarray) -> np.ndarray:
+        """Map scaled values back to prices"""
+        return scaled * self._scale_range + self._scale_min
+    
     def _create_lstm_dataset(self, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
         Create LSTM dataset with time steps
@@ -49,55 +140,138 @@ class LSTMForecaster:
         Returns:
             Tuple[np.ndarray, np.ndarray]: X and y data for LSTM
         """
-        x_data, y_data = [], []
-        for i in range(self.time_steps, len(data)):
-            x_data.append(data[i-self.time_steps:i, 0])
-            y_data.append(data[i, 0])
-        return np.array(x_data), np.array(y_data)
+        series = data[:, 0]
+        # One strided view over the series; the last window has no target
+        windows = sliding_window_view(series, self.time_steps)[:-1]
+        return np.ascontiguousarray(windows), series[self.time_steps:].copy()
     
-    def _build_model(self, input_shape: Tuple[int, int]) -> Sequential:
+    def _use_mixed_precision(self) -> bool:
+        """
+        Decide whether to train under the mixed_float16 policy
+        
+        Returns:
+            bool: True when configured, or when left unset and a GPU is present
+        """
+        if self.mixed_precision is not None:
+            return self.mixed_precision
+        # float16 only pays off on Tensor Cores; on CPU it is slower than float32
+        return bool(_get_tensorflow().config.list_physical_devices('GPU'))
+    
+    def _build_model(self, input_shape: Tuple[int, int], unroll: bool = False,
+                     mixed_precision: bool = False) -> "tf.keras.Sequential":
         """
         Build LSTM model architecture
         
         Args:
             input_shape (Tuple[int, int]): Input shape for LSTM
+            unroll (bool): Unroll the recurrent loop (needed for TFLite conversion)
+            mixed_precision (bool): Compute the LSTM layers in float16 with float32 weights
             
         Returns:
             Sequential: Compiled LSTM model
         """
-        model = Sequential()
-        model.add(LSTM(units=self.units, return_sequences=True, input_shape=input_shape))
-        model.add(LSTM(units=self.units))
-        model.add(Dense(units=1))
-        model.compile(optimizer='adam', loss='mean_squared_error')
+        keras = _get_tensorflow().keras
+        
+        # Pin the arguments the fused cuDNN kernel requires; any other value silently
+        # falls back to the generic RNN implementation on GPU
+        cudnn_args = dict(activation='tanh', recurrent_activation='sigmoid', recurrent_dropout=0.0,
+                          use_bias=True, unroll=unroll,
+                          dtype='mixed_float16' if mixed_precision else 'float32')
+        
+        model = keras.Sequential()
+        model.add(keras.Input(shape=input_shape))
+        for layer in range(self.num_layers):
+            # Every layer but the last feeds its full sequence to the next one
+            model.add(keras.layers.LSTM(units=self.units, return_sequences=layer < self.num_layers - 1,
+                                        **cudnn_args))
+        # Keep the output (and so the loss) in float32 for numerical stability
+        model.add(keras.layers.Dense(units=1, dtype='float32'))
+        
+        optimizer = keras.optimizers.Adam()
+        if mixed_precision:
+            # Scale the loss so small float16 gradients do not underflow
+            optimizer = keras.mixed_precision.LossScaleOptimizer(optimizer)
+        model.compile(optimizer=optimizer, loss='mean_squared_error')
         return model
     
-    def fit(self, data: pd.Series) -> bool:
+    def _make_dataset(self, x_data: np.ndarray, y_data: np.ndarray, shuffle: bool = False) -> "tf.data.Dataset":
+        """
+        Wrap training arrays in a batched tf.data pipeline
+        
+        Prefetching overlaps the host-to-device copy of the next batch with the current step.
+        
+        Args:
+            x_data (np.ndarray): Input windows of shape (samples, time_steps, 1)
+            y_data (np.ndarray): Targets of shape (samples, 1)
+            shuffle (bool): Reshuffle the samples every epoch, as Keras does for arrays
+            
+        Returns:
+            tf.data.Dataset: Batched, prefetching dataset
+        """
+        tf = _get_tensorflow()
+        
+        dataset = tf.data.Dataset.from_tensor_slices((x_data, y_data))
+        if shuffle:
+            dataset = dataset.shuffle(len(x_data), reshuffle_each_iteration=True)
+        
+        options = tf.data.Options()
+        options.experimental_optimization.map_and_batch_fusion = True
+        return dataset.batch(self.batch_size).prefetch(tf.data.AUTOTUNE).with_options(options)
+    
+    def fit(self, data: Union[pd.Series, np.ndarray]) -> bool:
         """
         Fit LSTM model to the data
         
+        Fitting is skipped when the model was already trained on identical data.
+        
         Args:
-            data (pd.Series): Time series data to fit
+            data (Union[pd.Series, np.ndarray]): Time series data to fit
             
         Returns:
             bool: True if successful, False otherwise
         """
         try:
+            values = self._as_array(data)
+            data_hash = hash(values.tobytes())
+            if self.model is not None and data_hash == self._last_data_hash:
+                logger.info("LSTM model already fitted on this data")
+                return True
+            
             logger.info("Fitting LSTM model")
+            self._last_data_hash = None
             
             # Scale the data
-            scaled_data = self.scaler.fit_transform(data.values.reshape(-1, 1))
+            scaled_data = self._fit_scaler(values)
             
             # Create LSTM dataset
             x_data, y_data = self._create_lstm_dataset(scaled_data)
             
-            # Reshape for LSTM
-            x_data = x_data.reshape((x_data.shape[0], x_data.shape[1], 1))
-            y_data = y_data.reshape(-1, 1)
+            # Reshape for LSTM (float32, as cuDNN requires)
+            x_data = x_data[..., np.newaxis].astype(np.float32, copy=False)
+            y_data = y_data.reshape(-1, 1).astype(np.float32, copy=False)
             
             # Build and train model
-            self.model = self._build_model((x_data.shape[1], 1))
-            self.model.fit(x_data, y_data, epochs=self.epochs, batch_size=self.batch_size, verbose=0)
+            self.model = self._build_model((x_data.shape[1], 1), mixed_precision=self._use_mixed_precision())
+            # Hold out the most recent windows and stop once their loss stops improving
+            split = int(len(x_data) * 0.9) if len(x_data) >= 10 else len(x_data)
+            train_ds = self._make_dataset(x_data[:split], y_data[:split], shuffle=True)
+            val_ds = self._make_dataset(x_data[split:], y_data[split:]) if split < len(x_data) else None
+            early_stopping = _get_tensorflow().keras.callbacks.EarlyStopping(
+                monitor='val_loss' if val_ds is not None else 'loss', patience=2, restore_best_weights=True)
+            # The dataset reshuffles itself; Keras' own shuffle flag only warns for datasets
+            self.model.fit(train_ds, epochs=self.epochs, validation_data=val_ds,
+                           callbacks=[early_stopping], shuffle=False, verbose=0)
+            
+            # Prepare the inference backend
+            self.interpreter = self._convert_to_tflite() if self.backend == "tflite" else None
+            self._rollout_fn = None
+            self._predict_fn = None
+            if self.backend == "numba":
+                self._extract_weights()
+            
+            # Keep the windows for forecast() and mark this data as fitted
+            self._cached_x = x_data
+            self._last_data_hash = data_hash
             
             logger.info("LSTM model fitted successfully")
             return True
@@ -106,40 +280,32 @@ class LSTMForecaster:
             logger.error(f"Error fitting LSTM model: {str(e)}")
             return False
     
-    def forecast(self, data: pd.Series) -> Tuple[np.ndarray, float]:
+    def forecast(self, data: Union[pd.Series, np.ndarray]) -> Tuple[np.ndarray, float]:
         """
         Generate forecast using LSTM model
         
         Args:
-            data (pd.Series): Time series data
+            data (Union[pd.Series, np.ndarray]): Time series data
             
         Returns:
             Tuple[np.ndarray, float]: Forecast values and accuracy
         """
         try:
             logger.info("Generating LSTM forecast")
+            values = self._as_array(data)
             
             # Fit the model first
-            if not self.fit(data):
+            if not self.fit(values):
                 raise Exception("Failed to fit LSTM model")
             
-            # Scale the data
-            scaled_data = self.scaler.fit_transform(data.values.reshape(-1, 1))
-            
-            # Create LSTM dataset for predictions
-            x_data, y_data = self._create_lstm_dataset(scaled_data)
-            
-            # Reshape for LSTM
-            x_data = x_data.reshape((x_data.shape[0], x_data.shape[1], 1))
-            
-            # Generate predictions
-            lstm_predictions = self.model.predict(x_data)
+            # Generate predictions on the windows built during fit
+            lstm_predictions = self._predict(self._cached_x)
             
             # Inverse transform predictions
-            lstm_predictions = self.scaler.inverse_transform(lstm_predictions.reshape(-1, 1))
+            lstm_predictions = self._inverse(lstm_predictions.reshape(-1, 1))
             
             # Calculate accuracy
-            accuracy = self._calculate_accuracy(data, lstm_predictions)
+            accuracy = self._calculate_accuracy(values, lstm_predictions)
             
             logger.info(f"LSTM forecast generated successfully with {accuracy:.2f}% accuracy")
             return lstm_predictions, accuracy
@@ -149,12 +315,147 @@ class LSTMForecaster:
             # Return default values
             return np.zeros(len(data) - self.time_steps), 0.0
     
-    def _calculate_accuracy(self, data: pd.Series, predictions: np.ndarray) -> float:
+    def _convert_to_tflite(self) -> Optional["tf.lite.Interpreter"]:
+        """
+        Convert the trained model to an in-memory TFLite interpreter
+        
+        Returns:
+            Optional[tf.lite.Interpreter]: Interpreter, or None if conversion failed
+        """
+        try:
+            logger.info("Converting LSTM model to TFLite")
+            tf = _get_tensorflow()
+            
+            # TFLite cannot lower the Keras LSTM while-loop, so convert an unrolled copy
+            inference_model = self._build_model((self.time_steps, 1), unroll=True)
+            inference_model.set_weights(self.model.get_weights())
+            
+            converter = tf.lite.TFLiteConverter.from_keras_model(inference_model)
+            if self.quantize:
+                # Int8 weights with float activations (no calibration dataset needed)
+                converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            
+            interpreter = tf.lite.Interpreter(model_content=converter.convert())
+            interpreter.allocate_tensors()
+            return interpreter
+            
+        except Exception as e:
+            logger.warning(f"TFLite conversion failed, using Keras for inference: {str(e)}")
+            return None
+    
+    def _extract_weights(self) -> None:
+        """Copy the trained layer weights to contiguous float32 arrays for the numba kernels"""
+        self._lstm_weights = []
+        for layer in self.model.layers:
+            weights = [np.ascontiguousarray(w, dtype=np.float32) for w in layer.get_weights()]
+            if isinstance(layer, _get_tensorflow().keras.layers.LSTM):
+                self._lstm_weights.append(tuple(weights))
+            else:
+                self._dense_weights = tuple(weights)
+    
+    def _predict_numba(self, x_input: np.ndarray) -> np.ndarray:
+        """
+        Run the trained model with the numba LSTM kernels
+        
+        Args:
+            x_input (np.ndarray): Input of shape (batch, time_steps, 1)
+            
+        Returns:
+            np.ndarray: Predictions of shape (batch, 1)
+        """
+        hidden = np.ascontiguousarray(x_input, dtype=np.float32)
+        for kernel, recurrent_kernel, bias in self._lstm_weights:
+            hidden = _lstm_layer(hidden, kernel, recurrent_kernel, bias)
+        dense_kernel, dense_bias = self._dense_weights
+        return hidden[:, -1, :] @ dense_kernel + dense_bias
+    
+    def _predict(self, x_input: np.ndarray) -> np.ndarray:
+        """
+        Run the trained model on a batch of input sequences
+        
+        Args:
+            x_input (np.ndarray): Input of shape (batch, time_steps, 1)
+            
+        Returns:
+            np.ndarray: Predictions of shape (batch, 1)
+        """
+        if self.backend == "numba":
+            return self._predict_numba(x_input)
+        if self.interpreter is None:
+            return self._predict_keras(x_input)
+        
+        input_details = self.interpreter.get_input_details()[0]
+        output_details = self.interpreter.get_output_details()[0]
+        
+        # Resize only when the batch shape changes
+        if tuple(input_details['shape']) != x_input.shape:
+            self.interpreter.resize_tensor_input(input_details['index'], x_input.shape)
+            self.interpreter.allocate_tensors()
+        
+        self.interpreter.set_tensor(input_details['index'], x_input.astype(np.float32))
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(output_details['index']).copy()
+    
+    def _predict_keras(self, x_input: np.ndarray) -> np.ndarray:
+        """
+        Run the Keras model through a graph traced once for any batch size
+        
+        Args:
+            x_input (np.ndarray): Input of shape (batch, time_steps, 1)
+            
+        Returns:
+            np.ndarray: Predictions of shape (batch, 1)
+        """
+        tf = _get_tensorflow()
+        
+        if self._predict_fn is None:
+            model = self.model
+            
+            # Calling the model directly skips the per-call setup done by model.predict
+            @tf.function(input_signature=[tf.TensorSpec([None, None, 1], tf.float32)])
+            def predict(x):
+                return model(x, training=False)
+            
+            self._predict_fn = predict
+        
+        return self._predict_fn(tf.constant(x_input, dtype=tf.float32)).numpy()
+    
+    def _rollout(self, seed: np.ndarray, steps: int) -> np.ndarray:
+        """
+        Run the autoregressive Keras rollout as a single graph call
+        
+        Args:
+            seed (np.ndarray): Scaled input sequence of shape (time_steps, 1)
+            steps (int): Number of future steps to predict
+            
+        Returns:
+            np.ndarray: Scaled predictions of shape (steps, 1)
+        """
+        tf = _get_tensorflow()
+        
+        if self._rollout_fn is None:
+            model = self.model
+            
+            @tf.function(reduce_retracing=True)
+            def rollout(seq, steps):
+                out = tf.TensorArray(tf.float32, size=steps)
+                for i in tf.range(steps):
+                    nxt = model(seq, training=False)
+                    out = out.write(i, nxt[0, 0])
+                    seq = tf.concat([seq[:, 1:, :], nxt[:, None, :]], axis=1)
+                return out.stack()
+            
+            self._rollout_fn = rollout
+        
+        seq = tf.constant(seed[np.newaxis, ...], dtype=tf.float32)
+        return self._rollout_fn(seq, tf.constant(steps)).numpy().reshape(-1, 1)
+    
+    def _calculate_accuracy(self, data: Union[pd.Series, np.ndarray], predictions: np.ndarray) -> float:
         """
         Calculate forecast accuracy using MAPE
         
         Args:
-            data (pd.Series): Actual data
+            data (Union[pd.Series, np.ndarray]): Actual data
             predictions (np.ndarray): Predicted values
             
         Returns:
@@ -162,7 +463,7 @@ class LSTMForecaster:
         """
         try:
             # Get actual values corresponding to predictions
-            actual_values = data[-len(predictions):].values
+            actual_values = self._as_array(data)[-len(predictions):].ravel()
             
             # Calculate MAPE
             mape = mean_absolute_percentage_error(actual_values, predictions.flatten())
@@ -176,12 +477,12 @@ class LSTMForecaster:
             logger.error(f"Error calculating accuracy: {str(e)}")
             return 0.0
     
-    def predict_future(self, data: pd.Series, future_steps: int = 30) -> np.ndarray:
+    def predict_future(self, data: Union[pd.Series, np.ndarray], future_steps: int = 30) -> np.ndarray:
         """
         Predict future values beyond the training data
         
         Args:
-            data (pd.Series): Historical data
+            data (Union[pd.Series, np.ndarray]): Historical data
             future_steps (int): Number of future steps to predict
             
         Returns:
@@ -190,33 +491,33 @@ class LSTMForecaster:
         try:
             logger.info(f"Predicting {future_steps} future steps")
             
-            if not self.fit(data):
+            values = self._as_array(data)
+            if not self.fit(values):
                 raise Exception("Failed to fit LSTM model")
             
             # Get the last time_steps values
-            last_sequence = data[-self.time_steps:].values.reshape(-1, 1)
-            last_sequence_scaled = self.scaler.transform(last_sequence)
-            
-            future_predictions = []
-            current_sequence = last_sequence_scaled.copy()
-            
-            for _ in range(future_steps):
-                # Reshape for prediction
-                x_input = current_sequence.reshape((1, self.time_steps, 1))
-                
-                # Predict next value
-                next_pred = self.model.predict(x_input, verbose=0)
-                
-                # Add to predictions
-                future_predictions.append(next_pred[0, 0])
+            last_sequence = values[-self.time_steps:]
+            last_sequence_scaled = self._scale(last_sequence)
+            
+            # Keras inference: keep the whole rollout inside one tf.function
+            if self.backend != "numba" and self.interpreter is None:
+                future_predictions = self._inverse(self._rollout(last_sequence_scaled, future_steps))
+                logger.info("Future predictions generated successfully")
+                return future_predictions.flatten()
+            
+            # Seed followed by the predictions; each window is a view, so no per-step copy
+            buffer = np.empty((self.time_steps + future_steps, 1), dtype=np.float32)
+            buffer[:self.time_steps] = last_sequence_scaled
+            
+            for i in range(future_steps):
+                # Window ending at the latest prediction
+                x_input = buffer[np.newaxis, i:i + self.time_steps]
                 
-                # Update sequence for next prediction
-                current_sequence = np.roll(current_sequence, -1)
-                current_sequence[-1] = next_pred[0, 0]
+                # Predict next value and append it to the sequence
+                buffer[self.time_steps + i, 0] = self._predict(x_input)[0, 0]
             
             # Inverse transform predictions
-            future_predictions = np.array(future_predictions).reshape(-1, 1)
-            future_predictions = self.scaler.inverse_transform(future_predictions)
+            future_predictions = self._inverse(buffer[self.time_steps:])
             
             logger.info("Future predictions generated successfully")
             return future_predictions.flatten()
@@ -237,6 +538,7 @@ class LSTMForecaster:
             summary = []
             summary.append("LSTM Model Summary:")
             summary.append(f"Time Steps: {self.time_steps}")
+            summary.append(f"LSTM Layers: {self.num_layers}")
             summary.append(f"LSTM Units: {self.units}")
             summary.append(f"Training Epochs: {self.epochs}")
             summary.append(f"Batch Size: {self.batch_size}")
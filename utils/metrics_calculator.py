@@ -4,6 +4,8 @@ Calculates various stock performance metrics
 """
 
 import pandas as pd
+import numpy as np
+from numba import njit
 from typing import Dict, Any
 import logging
 
@@ -11,6 +13,99 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The NaN-aware kernels below skip fastmath, which would let the compiler assume no NaNs
+@njit('f8[:](f8[:], f8)', cache=True)
+def _ewma(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Exponentially weighted moving average, like pandas ewm(adjust=False).mean()
+    
+    As in pandas, NaNs carry the previous average forward and the weight of the
+    history keeps decaying across them.
+    """
+    y = np.empty_like(x)
+    average = np.nan
+    old_weight = 1.0
+    for i in range(x.shape[0]):
+        if average != average:
+            # Leading NaNs stay NaN until the first observation
+            average = x[i]
+        else:
+            old_weight *= 1 - alpha
+            if x[i] == x[i]:
+                average = (old_weight * average + alpha * x[i]) / (old_weight + alpha)
+                old_weight = 1.0
+        y[i] = average
+    return y
+
+@njit('f8(f8[:], i8)', cache=True)
+def _rsi(close: np.ndarray, window: int) -> float:
+    """Latest RSI from simple averages of the gains and losses over the trailing window"""
+    n = close.shape[0]
+    if n <= window:
+        return np.nan
+    gain = 0.0
+    loss = 0.0
+    for i in range(n - window, n):
+        # A change involving a NaN close counts as neither gain nor loss, as in pandas
+        d = close[i] - close[i - 1]
+        if d > 0:
+            gain += d
+        elif d < 0:
+            loss -= d
+    if loss == 0:
+        return 100.0 if gain > 0 else np.nan
+    return 100 - 100 / (1 + gain / loss)
+
+@njit('f8(f8[:])', cache=True)
+def _max_drawdown(close: np.ndarray) -> float:
+    """Largest fall from a running peak, as a (non-positive) fraction of that peak"""
+    peak = np.nan
+    worst = np.nan
+    for i in range(close.shape[0]):
+        # NaN closes neither set a peak nor count as a drawdown
+        if close[i] != close[i]:
+            continue
+        if peak != peak or close[i] > peak:
+            peak = close[i]
+        drawdown = close[i] / peak - 1
+        if worst != worst or drawdown < worst:
+            worst = drawdown
+    return worst
+
+@njit('UniTuple(f8, 4)(f8[:])', cache=True, fastmath=True)
+def _moments(x: np.ndarray) -> tuple:
+    """Mean and the 2nd-4th central moment sums of x in one streaming (Welford) pass"""
+    mean = 0.0
+    m2 = 0.0
+    m3 = 0.0
+    m4 = 0.0
+    for i in range(x.shape[0]):
+        n = i + 1
+        delta = x[i] - mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term = delta * delta_n * i
+        mean += delta_n
+        m4 += term * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * m2 - 4 * delta_n * m3
+        m3 += term * delta_n * (n - 2) - 3 * delta_n * m2
+        m2 += term
+    return mean, m2, m3, m4
+
+def _quantile(x: np.ndarray, q: float) -> float:
+    """Linearly interpolated quantile (as pandas computes it) via partial sorting"""
+    n = x.shape[0]
+    if n == 0:
+        return np.nan
+    h = (n - 1) * q
+    lo = int(h)
+    hi = min(lo + 1, n - 1)
+    part = np.partition(x, [lo, hi])
+    return float(part[lo] + (h - lo) * (part[hi] - part[lo]))
+
+def _last_mean(x: np.ndarray, window: int) -> float:
+    """Mean of the trailing window, NaN when the series is shorter than the window"""
+    return float(x[-window:].mean()) if x.shape[0] >= window else np.nan
+
 def calculate_stock_metrics(data: pd.DataFrame) -> Dict[str, Any]:
     """
     Calculate comprehensive stock metrics from historical data
@@ -24,32 +119,29 @@ def calculate_stock_metrics(data: pd.DataFrame) -> Dict[str, Any]:
     try:
         logger.info("Calculating stock metrics")
         
-        # Basic price metrics
-        highest_price = data['Close'].max()
-        lowest_price = data['Close'].min()
-        average_price = data['Close'].mean()
-        
-        # Get the index (timestamp) of the highest and lowest price
-        best_time_to_sell = data['Close'].idxmax()
-        best_time_to_buy = data['Close'].idxmin()
+        # Work on the raw arrays (Close may be a single-column frame)
+        close = data['Close'].to_numpy(dtype=np.float64).ravel()
+        volume = data['Volume'].to_numpy().ravel()
         
-        # Ensure we are working with a Timestamp, not a Series
-        if isinstance(best_time_to_sell, pd.Series):
-            best_time_to_sell = best_time_to_sell.iloc[0]
-        if isinstance(best_time_to_buy, pd.Series):
-            best_time_to_buy = best_time_to_buy.iloc[0]
+        # Basic price metrics as plain floats; the extremes' positions give their dates
+        idx_max = int(np.nanargmax(close))
+        idx_min = int(np.nanargmin(close))
+        highest_price = float(close[idx_max])
+        lowest_price = float(close[idx_min])
+        average_price = float(np.nanmean(close))
         
-        # Convert to string format
-        best_time_to_sell_str = best_time_to_sell.strftime('%Y-%m-%d')
-        best_time_to_buy_str = best_time_to_buy.strftime('%Y-%m-%d')
+        # Convert the timestamps of the highest and lowest price to string format
+        best_time_to_sell_str = data.index[idx_max].strftime('%Y-%m-%d')
+        best_time_to_buy_str = data.index[idx_min].strftime('%Y-%m-%d')
         
-        # Calculate additional metrics
-        total_return = ((data['Close'].iloc[-1] - data['Close'].iloc[0]) / data['Close'].iloc[0]) * 100
-        volatility = data['Close'].pct_change().std() * 100
+        # Calculate additional metrics (sample std of daily returns, as pandas computes it)
+        total_return = float((close[-1] - close[0]) / close[0] * 100)
+        daily_returns = np.diff(close) / close[:-1]
+        volatility = float(np.nanstd(daily_returns, ddof=1) * 100)
         
         # Volume metrics
-        avg_volume = data['Volume'].mean()
-        max_volume = data['Volume'].max()
+        avg_volume = float(np.nanmean(volume))
+        max_volume = np.nanmax(volume).item()
         
         metrics = {
             "Highest Price": highest_price,
@@ -83,29 +175,28 @@ def calculate_technical_indicators(data: pd.DataFrame) -> Dict[str, Any]:
     try:
         logger.info("Calculating technical indicators")
         
-        # Moving averages
-        data['MA_20'] = data['Close'].rolling(window=20).mean()
-        data['MA_50'] = data['Close'].rolling(window=50).mean()
+        # Work on a copy of Close so the caller's frame is left untouched
+        close = np.ascontiguousarray(data['Close'].to_numpy(dtype=np.float64).ravel())
+        
+        # Moving averages (only the latest value is reported)
+        ma_20 = _last_mean(close, 20)
+        ma_50 = _last_mean(close, 50)
         
         # RSI calculation
-        delta = data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        data['RSI'] = 100 - (100 / (1 + rs))
-        
-        # MACD calculation
-        exp1 = data['Close'].ewm(span=12, adjust=False).mean()
-        exp2 = data['Close'].ewm(span=26, adjust=False).mean()
-        data['MACD'] = exp1 - exp2
-        data['Signal_Line'] = data['MACD'].ewm(span=9, adjust=False).mean()
+        rsi = _rsi(close, 14)
+        
+        # MACD calculation (alpha = 2 / (span + 1))
+        exp1 = _ewma(close, 2 / 13)
+        exp2 = _ewma(close, 2 / 27)
+        macd = exp1 - exp2
+        signal_line = _ewma(macd, 2 / 10)
         
         indicators = {
-            "MA_20": data['MA_20'].iloc[-1],
-            "MA_50": data['MA_50'].iloc[-1],
-            "RSI": data['RSI'].iloc[-1],
-            "MACD": data['MACD'].iloc[-1],
-            "Signal_Line": data['Signal_Line'].iloc[-1]
+            "MA_20": ma_20,
+            "MA_50": ma_50,
+            "RSI": rsi,
+            "MACD": float(macd[-1]),
+            "Signal_Line": float(signal_line[-1])
         }
         
         logger.info("Successfully calculated technical indicators")
@@ -129,20 +220,39 @@ def calculate_risk_metrics(data: pd.DataFrame) -> Dict[str, Any]:
         logger.info("Calculating risk metrics")
         
         # Calculate daily returns
-        returns = data['Close'].pct_change().dropna()
+        close = np.ascontiguousarray(data['Close'].to_numpy(dtype=np.float64).ravel())
+        # Pad gaps with the last close first, as pandas' pct_change() does by default
+        last_valid = np.maximum.accumulate(np.where(np.isnan(close), 0, np.arange(close.shape[0])))
+        padded = close[last_valid]
+        returns = np.diff(padded) / padded[:-1]
+        returns = np.ascontiguousarray(returns[~np.isnan(returns)])
+        
+        # Sample statistics with pandas' bias corrections, from a single pass over the returns
+        n = returns.shape[0]
+        mean, m2, m3, m4 = _moments(returns)
+        std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+        if n > 2:
+            skewness = 0.0 if m2 == 0 else np.sqrt(n * (n - 1)) / (n - 2) * (n ** 0.5 * m3 / m2 ** 1.5)
+        else:
+            skewness = np.nan
+        if n > 3:
+            kurtosis = 0.0 if m2 == 0 else ((n + 1) * n * (n - 1) * m4 / ((n - 2) * (n - 3) * m2 ** 2)
+                                           - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3)))
+        else:
+            kurtosis = np.nan
         
         # Risk metrics
-        sharpe_ratio = returns.mean() / returns.std() * (252 ** 0.5)  # Annualized
-        max_drawdown = (data['Close'] / data['Close'].expanding().max() - 1).min()
-        var_95 = returns.quantile(0.05)  # 95% VaR
+        sharpe_ratio = np.nan if not std else mean / std * (252 ** 0.5)  # Annualized
+        max_drawdown = _max_drawdown(close)
+        var_95 = _quantile(returns, 0.05)  # 95% VaR
         
         risk_metrics = {
-            "Sharpe Ratio": sharpe_ratio,
+            "Sharpe Ratio": float(sharpe_ratio),
             "Max Drawdown": max_drawdown,
             "Value at Risk (95%)": var_95,
-            "Standard Deviation": returns.std(),
-            "Skewness": returns.skew(),
-            "Kurtosis": returns.kurtosis()
+            "Standard Deviation": float(std),
+            "Skewness": float(skewness),
+            "Kurtosis": float(kurtosis)
         }
         
         logger.info("Successfully calculated risk metrics")
@@ -4,54 +4,71 @@ Handles Streamlit UI components and styling
 """
 
 import streamlit as st
+import functools
 from datetime import datetime
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Sequence
+
+# Static markup, built once at import instead of on every rerun
+_HEADER_HTML = """
+    <div style="background-color:#4CAF50;padding:15px;border-radius:10px;">
+        <h1 style="color:white;text-align:center;">Stock Data Analyzer</h1>
+    </div>
+"""
+
+_FOOTER_HTML = """
+    <style>
+        footer {visibility: hidden;} /* Hide default Streamlit footer */
+        .custom-footer {
+            position: fixed;
+            left: 0;
+            bottom: 0;
+            width: 100%;
+            background-color: black;
+            color: white;
+            text-align: center;
+            padding: 10px 0;
+            font-size: 18px;
+            z-index: 9999;
+        }
+    </style>
+    <div class="custom-footer">
+        Developed by Pranav Maheshwari | Stock Data Project
+    </div>
+"""
+
+@functools.lru_cache(maxsize=64)
+def _section_header_html(title: str, size: int) -> str:
+    """Markup for a centred section header"""
+    return f"<h3 style='text-align: center; font-size: {size}px;'>{title}</h3>"
+
+@functools.lru_cache(maxsize=16)
+def _spacing_html(lines: int) -> str:
+    """Markup for the given number of line breaks"""
+    return "<br>" * lines
 
 def create_header():
     """Create custom header with styling"""
-    st.markdown("""
-        <div style="background-color:#4CAF50;padding:15px;border-radius:10px;">
-            <h1 style="color:white;text-align:center;">Stock Data Analyzer</h1>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
 
 def create_footer():
     """Create custom footer with credits"""
-    st.markdown("""
-        <style>
-            footer {visibility: hidden;} /* Hide default Streamlit footer */
-            .custom-footer {
-                position: fixed;
-                left: 0;
-                bottom: 0;
-                width: 100%;
-                background-color: black;
-                color: white;
-                text-align: center;
-                padding: 10px 0;
-                font-size: 18px;
-                z-index: 9999;
-            }
-        </style>
-        <div class="custom-footer">
-            Developed by Pranav Maheshwari | Stock Data Project
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
 
-def create_sidebar(stock_symbols: Dict[str, Any]) -> Tuple[str, datetime, datetime]:
+def create_sidebar(stock_options: Sequence[str], default_start: datetime = datetime(2020, 1, 1),
+                   default_end: datetime = datetime(2025, 1, 1)) -> Tuple[str, datetime, datetime]:
     """
     Create sidebar with stock selection and date inputs
     
     Args:
-        stock_symbols (Dict[str, Any]): Dictionary of stock symbols and metadata
+        stock_options (Sequence[str]): Selectbox labels in "SYMBOL - Name" form
+        default_start (datetime): Initially selected start date
+        default_end (datetime): Initially selected end date
         
     Returns:
         Tuple[str, datetime, datetime]: Selected stock, start date, end date
     """
     st.sidebar.header("Enter Stock Details")
     
-    # Convert stock symbols dictionary to list of display names
-    stock_options = [f"{symbol} - {details['name']}" for symbol, details in stock_symbols.items()]
     selected_stock_option = st.sidebar.selectbox("Select Stock Symbol", stock_options)
     
     # Extract the stock symbol from the selected option
@@ -63,14 +80,14 @@ def create_sidebar(stock_symbols: Dict[str, Any]) -> Tuple[str, datetime, dateti
     
     start_date = st.sidebar.date_input(
         "Start Date", 
-        datetime(2020, 1, 1), 
+        default_start, 
         min_value=min_date, 
         max_value=max_date
     )
     
     end_date = st.sidebar.date_input(
         "End Date", 
-        datetime(2025, 1, 1), 
+        default_end, 
         min_value=min_date, 
         max_value=max_date
     )
@@ -98,16 +115,11 @@ def create_metrics_display(metrics: Dict[str, Any]) -> None:
     Args:
         metrics (Dict[str, Any]): Stock metrics dictionary
     """
-    # Extract scalar values from pandas Series
-    highest_price = metrics['Highest Price'].iloc[0] if hasattr(metrics['Highest Price'], 'iloc') else metrics['Highest Price']
-    lowest_price = metrics['Lowest Price'].iloc[0] if hasattr(metrics['Lowest Price'], 'iloc') else metrics['Lowest Price']
-    average_price = metrics['Average Price'].iloc[0] if hasattr(metrics['Average Price'], 'iloc') else metrics['Average Price']
-    
     st.markdown(
         f"""
-        <h3 style="font-size: 22px;">Highest Price: ₹{highest_price:.2f}</h3>
-        <h3 style="font-size: 22px;">Lowest Price: ₹{lowest_price:.2f}</h3>
-        <h3 style="font-size: 22px;">Average Price: ₹{average_price:.2f}</h3>
+        <h3 style="font-size: 22px;">Highest Price: ₹{metrics['Highest Price']:.2f}</h3>
+        <h3 style="font-size: 22px;">Lowest Price: ₹{metrics['Lowest Price']:.2f}</h3>
+        <h3 style="font-size: 22px;">Average Price: ₹{metrics['Average Price']:.2f}</h3>
         <h3 style="font-size: 22px;">Best Time to Sell: {metrics['Best Time to Sell']}</h3>
         <h3 style="font-size: 22px;">Best Time to Buy: {metrics['Best Time to Buy']}</h3>
         """, unsafe_allow_html=True
@@ -121,7 +133,7 @@ def create_section_header(title: str, size: int = 36) -> None:
         title (str): Header title
         size (int): Font size for the header
     """
-    st.markdown(f"<h3 style='text-align: center; font-size: {size}px;'>{title}</h3>", unsafe_allow_html=True)
+    st.markdown(_section_header_html(title, size), unsafe_allow_html=True)
 
 def create_data_table(title: str, data: Any) -> None:
     """
@@ -141,7 +153,7 @@ def add_spacing(lines: int = 2) -> None:
     Args:
         lines (int): Number of line breaks to add
     """
-    st.markdown("<br>" * lines, unsafe_allow_html=True)
+    st.markdown(_spacing_html(lines), unsafe_allow_html=True)
 
 def create_error_message(message: str) -> None:
     """